@@ -1,19 +1,39 @@
+import functools
+import hashlib
 import json
 import logging
 import os
+import sys
+import time
 from pathlib import Path
 from typing import List
+
+import pandas as pd
 from dotenv import load_dotenv
 from google import genai
 
-
-
-import pandas as pd
+# Put src/ on sys.path so common.* can be imported (see common/__init__.py)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.io import read_table
 
 load_dotenv()
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 PROCESSED_DATA_DIR = PROJECT_ROOT / "data" / "processed"
 JOINED_PATH = PROCESSED_DATA_DIR / "price_emissions_joined.csv"
+GEMINI_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "gemini"
+
+# NEM data is 5-minute, so a cached explanation is reused for at most that long
+CACHE_TTL_SECONDS = 300
+
+# Columns sent to the model, in prompt order
+PROMPT_COLUMNS = [
+    "timestamp",
+    "price",
+    "total_demand",
+    "dispatchable_generation",
+    "net_interchange",
+    "emissions_intensity",
+]
 
 
 logging.basicConfig(
@@ -23,7 +43,7 @@ logging.basicConfig(
 
 
 def _fetch_last_rows(region: str, n: int = 6, path: Path = JOINED_PATH) -> pd.DataFrame:
-    df = pd.read_csv(path, parse_dates=["timestamp"])
+    df = read_table(path, parse_dates=["timestamp"])
     if "REGIONID" in df.columns:
         df = df.rename(columns={"REGIONID": "region"})
     df = df[df["region"] == region].sort_values("timestamp")
@@ -44,24 +64,27 @@ def _build_prompt(region: str, df_tail: pd.DataFrame) -> str:
         "",
         "Here is the data (most recent row last):",
         "",
-        "timestamp, price, total_demand, dispatchable_generation, net_interchange, emissions_intensity",
+        ", ".join(PROMPT_COLUMNS),
     ]
-    for _, row in df_tail.iterrows():
-        lines.append(
-            f"{row['timestamp']}, {row['price']}, {row['total_demand']}, "
-            f"{row['dispatchable_generation']}, {row['net_interchange']}, {row['emissions_intensity']}"
-        )
+    # Values print through their column's numpy scalars, so a float32 value
+    # (from the Parquet twin) stays 89.50353 instead of widening to
+    # 89.50353240966797; the prompt, and its cache key, match a CSV read
+    columns = [df_tail["timestamp"]] + [df_tail[col].to_numpy() for col in PROMPT_COLUMNS[1:]]
+    lines.extend(", ".join(map(str, row)) for row in zip(*columns))
     lines.append("")
     lines.append("Now produce the explanation.")
     return "\n".join(lines)
 
 
-def generate_explanation(prompt: str, api_key: str) -> str:
-    # Create a Gemini client using the provided API key
-    client = genai.Client(api_key=api_key)
+@functools.lru_cache(maxsize=1)
+def _client() -> genai.Client:
+    # One client per process so its HTTPS connection pool is reused across calls
+    return genai.Client(api_key=os.environ["GEMINI_API_KEY"])
 
+
+def generate_explanation(prompt: str) -> str:
     # Call the Gemini 2.5 Flash model (current recommended fast model)
-    response = client.models.generate_content(
+    response = _client().models.generate_content(
         model="gemini-2.5-flash",
         contents=prompt,
     )
@@ -70,15 +93,41 @@ def generate_explanation(prompt: str, api_key: str) -> str:
     return response.text
 
 
+def _cached_explanation(prompt: str, ttl: float = CACHE_TTL_SECONDS) -> str:
+    """
+    generate_explanation with an on-disk cache keyed by sha256(prompt);
+    entries older than ttl seconds are regenerated.
+    """
+    key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    path = GEMINI_CACHE_DIR / f"{key}.json"
+
+    if path.exists() and time.time() - path.stat().st_mtime < ttl:
+        try:
+            text = json.loads(path.read_text(encoding="utf-8"))["text"]
+            logging.info("Using cached explanation (%s)", path.name)
+            return text
+        except (OSError, ValueError, KeyError):
+            logging.warning("Ignoring unreadable cache entry %s", path)
+
+    logging.info("Sending prompt to Gemini")
+    text = generate_explanation(prompt)
+
+    # write-then-rename so a concurrent reader never sees a partial file
+    GEMINI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps({"text": text, "ts": time.time()}), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return text
+
+
 def run_gemini_explainer(region: str = "NSW1", joined_path: Path = JOINED_PATH) -> str:
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
+    if not os.getenv("GEMINI_API_KEY"):
         raise RuntimeError("Please set GEMINI_API_KEY in your environment.")
 
     df_tail = _fetch_last_rows(region, n=6, path=joined_path)
     prompt = _build_prompt(region, df_tail)
-    logging.info("Sending prompt to Gemini for region %s", region)
-    explanation = generate_explanation(prompt, api_key)
+    logging.info("Explaining latest data for region %s", region)
+    explanation = _cached_explanation(prompt)
     logging.info("Explanation generated.")
     return explanation
 
@@ -1,8 +1,13 @@
 import logging
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+# Put src/ on sys.path so common.* can be imported (see common/__init__.py)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.io import read_csv, write_table
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"
 PROCESSED_DATA_DIR = PROJECT_ROOT / "data" / "processed"
@@ -30,11 +35,12 @@ def clean_emissions(
 
     Output columns:
       - timestamp          (datetime64[ns])
-      - region             (str)
+      - region             (category)
       - emissions_intensity (float, tCO2/MWh)
     """
     logging.info("Loading raw IBEI emissions from %s", input_path)
-    df = pd.read_csv(input_path)
+    # SETTLEMENTDATE ("YYYY/MM/DD HH:MM:SS") is parsed by Arrow during the scan
+    df = read_csv(input_path, parse_dates=["SETTLEMENTDATE"])
 
     df = df.rename(
         columns={
@@ -44,31 +50,23 @@ def clean_emissions(
         }
     )
 
-    df["timestamp"] = (
-        df["timestamp"]
-        .astype(str)
-        .str.strip()
-        .str.strip('"')
-    )
-
-    df["timestamp"] = pd.to_datetime(
-        df["timestamp"],
-        format="%Y/%m/%d %H:%M:%S",
-        errors="coerce",
-    )
+    # Region is a small fixed set: store as categorical codes. Categories are
+    # sorted so that sorting by code keeps the alphabetical row order.
+    df["region"] = df["region"].astype(pd.CategoricalDtype(sorted(VALID_REGIONS)))
 
     before = len(df)
-    df = df.drop_duplicates()
-    df = df.dropna(subset=["timestamp", "region", "emissions_intensity"])
-    df = df[df["region"].isin(VALID_REGIONS)]
+    df = (
+        df.drop_duplicates()
+        .dropna(subset=["timestamp", "region", "emissions_intensity"])
+        .loc[lambda d: d["region"].isin(VALID_REGIONS)]
+        .sort_values(["timestamp", "region"], ignore_index=True)
+    )
     after = len(df)
 
     logging.info("Emissions cleaned: %s -> %s rows", before, after)
 
-    df = df.sort_values(["timestamp", "region"]).reset_index(drop=True)
-
     logging.info("Saving clean emissions to %s", output_path)
-    df.to_csv(output_path, index=False)
+    write_table(df, output_path)
 
     return df
 
@@ -1,8 +1,13 @@
 import logging
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+# Put src/ on sys.path so common.* can be imported (see common/__init__.py)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.io import read_csv, write_table
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"
 PROCESSED_DATA_DIR = PROJECT_ROOT / "data" / "processed"
@@ -21,6 +26,17 @@ DEFAULT_CLEAN_PRICES = PROCESSED_DATA_DIR / "prices_clean.csv"
 # NEM regions we care about (you can tweak this)
 VALID_REGIONS = ["NSW1", "QLD1", "VIC1", "SA1", "TAS1"]
 
+# Raw numeric columns; float32 is ample for $/MWh and MW, and halves the
+# bytes every downstream groupby/rolling pass has to stream
+RAW_NUMERIC_COLS = [
+    "RRP",
+    "TOTALDEMAND",
+    "DEMANDFORECAST",
+    "DISPATCHABLEGENERATION",
+    "NETINTERCHANGE",
+    "INITIALSUPPLY",
+]
+
 
 def clean_prices(
     input_path: Path = DEFAULT_RAW_PRICES,
@@ -32,11 +48,17 @@ def clean_prices(
 
     Output columns:
       - timestamp (datetime64[ns])
-      - region   (str)
-      - price    (float, $/MWh)
+      - region   (category)
+      - price    (float32, $/MWh)
     """
     logging.info("Loading raw prices from %s", input_path)
-    df = pd.read_csv(input_path)
+    # Timestamps (explicit format "YYYY/MM/DD HH:MM:SS") and numeric casts
+    # are parsed by Arrow during the scan; unparseable values become NaT/NaN
+    df = read_csv(
+        input_path,
+        parse_dates=["SETTLEMENTDATE"],
+        dtypes={col: "float32" for col in RAW_NUMERIC_COLS},
+    )
 
     # Rename to simpler names
     df = df.rename(
@@ -53,60 +75,32 @@ def clean_prices(
         }
     )
 
-    # Parse timestamp (AEMO uses dd/mm/YYYY HH:MM)
-    # Clean up quoting/whitespace and parse explicit format "YYYY/MM/DD HH:MM:SS"
-    df["timestamp"] = (
-        df["timestamp"]
-        .astype(str)
-        .str.strip()
-        .str.strip('"')
-    )
-
-    df["timestamp"] = pd.to_datetime(
-        df["timestamp"],
-        format="%Y/%m/%d %H:%M:%S",
-        errors="coerce",
-    )
-
-    # Cast numeric columns
-    numeric_cols = [
-        "price",
-        "total_demand",
-        "demand_forecast",
-        "dispatchable_generation",
-        "net_interchange",
-        "initial_supply",
-    ]
-
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    # Region is a small fixed set: store as categorical codes. Categories are
+    # sorted so that sorting by code keeps the alphabetical row order.
+    df["region"] = df["region"].astype(pd.CategoricalDtype(sorted(VALID_REGIONS)))
 
     # Market suspended flag: make it 0/1 integer
     df["market_suspended_flag"] = (
         pd.to_numeric(df["market_suspended_flag"], errors="coerce")
         .fillna(0)
-        .astype(int)
+        .astype("int8")
     )
 
-    # Basic validation / filtering
+    # Basic validation / filtering, then sort for sanity.
+    # Filter negative or zero prices if you want to ignore them; for now we keep >= -1000,
+    # and keep only standard NEM regions (both in one row mask).
     before = len(df)
-    df = df.drop_duplicates()
-    df = df.dropna(subset=["timestamp", "region", "price"])
-
-    # Filter negative or zero prices if you want to ignore them; for now we keep >= -1000
-    df = df[df["price"] > -1000]
-
-    # Filter to standard NEM regions
-    df = df[df["region"].isin(VALID_REGIONS)]
-
+    df = (
+        df.drop_duplicates()
+        .dropna(subset=["timestamp", "region", "price"])
+        .loc[lambda d: (d["price"] > -1000) & d["region"].isin(VALID_REGIONS)]
+        .sort_values(["timestamp", "region"], ignore_index=True)
+    )
     after = len(df)
     logging.info("Prices cleaned: %s -> %s rows", before, after)
 
-    # Sort for sanity
-    df = df.sort_values(["timestamp", "region"]).reset_index(drop=True)
-
     logging.info("Saving clean prices to %s", output_path)
-    df.to_csv(output_path, index=False)
+    write_table(df, output_path)
 
     return df
 
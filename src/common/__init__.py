@@ -0,0 +1,12 @@
+"""
+Helpers shared by the pipeline scripts under src/.
+
+The scripts are run directly (python src/clean/clean_prices.py, ...), so each
+one starts with the same bootstrap line, which puts src/ on sys.path:
+
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+After it, common.* (and the other src/ folders, e.g. clean.* or transform.*)
+import as packages. Running from src/ with python -m (for example
+cd src && python -m clean.clean_prices) works the same way.
+"""
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# The NEMWeb directory indexes only change every 5-minute interval
+HTTP_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "http"
+INDEX_CACHE_SECONDS = 300
+
+# One cached session for index pages, shared by every ingest module
+INDEX_SESSION = requests_cache.CachedSession(
+    cache_name=str(HTTP_CACHE_DIR),
+    backend="filesystem",
+    expire_after=INDEX_CACHE_SECONDS,
+)
+
+# Shared keep-alive sessions: both mount one adapter, so index and file
+# requests reuse the same TCP+TLS connections to nemweb.com.au
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+for _session in (SESSION, INDEX_SESSION):
+    _session.headers["User-Agent"] = "energy-analytics/1.0"
+    _session.mount("https://", _ADAPTER)
+    _session.mount("http://", _ADAPTER)
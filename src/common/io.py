@@ -0,0 +1,111 @@
+import logging
+from pathlib import Path
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+
+# ISO (DataFrame.to_csv output) and AEMO raw files ("2025/12/05 04:05:00")
+TIMESTAMP_PARSERS = [pacsv.ISO8601, "%Y/%m/%d %H:%M:%S"]
+
+
+def read_csv(
+    path: Path,
+    parse_dates: Sequence[str] = (),
+    categories: Sequence[str] = (),
+    dtypes: Optional[Mapping[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Read a pipeline CSV with the multithreaded Arrow reader and return a
+    NumPy-backed DataFrame. Quoting, timestamp parsing and casts all happen
+    during the scan.
+
+    - parse_dates: columns typed as timestamps (see TIMESTAMP_PARSERS)
+    - categories:  string columns dictionary-encoded into pandas categoricals
+    - dtypes:      numeric columns cast on read, e.g. {"RRP": "float32"}
+
+    If a value does not convert, the file is re-read untyped and those
+    columns are coerced in pandas instead (bad values -> NaT/NaN).
+    """
+    dtypes = dict(dtypes or {})
+    column_types = {col: pa.timestamp("ns") for col in parse_dates}
+    column_types.update({col: pa.from_numpy_dtype(np.dtype(t)) for col, t in dtypes.items()})
+    column_types.update({col: pa.dictionary(pa.int32(), pa.string()) for col in categories})
+
+    try:
+        df = _read_arrow_csv(path, column_types)
+    except pa.ArrowInvalid:
+        logging.warning("Typed read of %s failed; coercing columns after read", path)
+        df = _read_arrow_csv(
+            path,
+            {col: pa.dictionary(pa.int32(), pa.string()) for col in categories},
+        )
+        for col in parse_dates:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col], format="mixed", errors="coerce")
+        for col, t in dtypes.items():
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype(t)
+
+    return _sort_categories(df, categories)
+
+
+def read_table(
+    path: Path,
+    parse_dates: Sequence[str] = (),
+    categories: Sequence[str] = (),
+    dtypes: Optional[Mapping[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Read a processed table, preferring its Parquet twin (same stem) when it
+    exists and is at least as new as the CSV. Parquet keeps dtypes, so
+    nothing is re-parsed; falls back to read_csv otherwise.
+    """
+    path = Path(path)
+    parquet_path = path.with_suffix(".parquet")
+    if parquet_path.exists() and (
+        not path.exists() or parquet_path.stat().st_mtime >= path.stat().st_mtime
+    ):
+        return _sort_categories(pd.read_parquet(parquet_path, engine="pyarrow"), categories)
+    return read_csv(path, parse_dates=parse_dates, categories=categories, dtypes=dtypes)
+
+
+def write_table(df: pd.DataFrame, path: Path) -> None:
+    """
+    Write a processed table as CSV plus a zstd-compressed Parquet twin.
+    """
+    path = Path(path)
+    df.to_csv(path, index=False)
+    df.to_parquet(path.with_suffix(".parquet"), engine="pyarrow", compression="zstd", index=False)
+
+
+def _read_arrow_csv(path: Path, column_types: dict) -> pd.DataFrame:
+    table = pacsv.read_csv(
+        path,
+        parse_options=pacsv.ParseOptions(quote_char='"'),
+        convert_options=pacsv.ConvertOptions(
+            column_types=column_types,
+            timestamp_parsers=TIMESTAMP_PARSERS,
+            # empty fields become NaN, as with pd.read_csv
+            strings_can_be_null=True,
+        ),
+    )
+    # A column with no values at all is typed null, which to_pandas() turns
+    # into object None; pd.read_csv gives float64 NaN
+    schema = pa.schema(
+        [pa.field(f.name, pa.float64()) if pa.types.is_null(f.type) else f for f in table.schema]
+    )
+    return table.cast(schema).to_pandas()
+
+
+def _sort_categories(df: pd.DataFrame, categories: Sequence[str]) -> pd.DataFrame:
+    # Arrow keeps categories in order of first appearance; sort them as
+    # pd.read_csv(dtype="category") does so groupby/sort order is stable
+    for col in categories:
+        if col in df.columns:
+            values = df[col].astype("category")
+            df[col] = values.cat.reorder_categories(sorted(values.cat.categories))
+    return df
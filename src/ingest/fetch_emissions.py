@@ -1,12 +1,16 @@
+import io
 import logging
 import re
+import sys
 from pathlib import Path
 from typing import Tuple, List
 from urllib.parse import urljoin
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+
+# Put src/ on sys.path so common.* can be imported (see common/__init__.py)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.http import INDEX_SESSION, SESSION
 
 # ---------- Config ----------
 
@@ -30,15 +34,14 @@ def _find_latest_file_url(index_url: str, extensions: Tuple[str, ...]) -> str:
     whose href ends with one of the given extensions (case-insensitive).
     """
     logging.info("Fetching IBEI index from %s", index_url)
-    resp = requests.get(index_url, timeout=30)
+    resp = INDEX_SESSION.get(index_url, timeout=30)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
 
-    hrefs: List[str] = []
-    for link in soup.find_all("a", href=True):
-        href = link["href"]
-        if any(href.lower().endswith(ext.lower()) for ext in extensions):
-            hrefs.append(href)
+    # Scan hrefs directly (same approach as the Public_Prices index) rather
+    # than building a DOM just to list links
+    ext_pattern = "|".join(re.escape(ext.lstrip(".")) for ext in extensions)
+    pattern = rf'href=[\'"]([^\'"]+\.(?:{ext_pattern}))[\'"]'
+    hrefs: List[str] = re.findall(pattern, resp.text, flags=re.IGNORECASE)
 
     if not hrefs:
         raise RuntimeError(f"No files with extensions {extensions} found at {index_url}")
@@ -60,42 +63,45 @@ def _extract_ibei_minimal(text: str) -> pd.DataFrame:
 
     Handles both tab- or comma-separated formats.
     """
-    rows: List[list] = []
-
-    for raw_line in text.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-
-        # Keep only data rows: start with D,IBEI or D\tIBEI
-        if not (line.startswith("D,IBEI") or line.startswith("D\tIBEI")):
-            continue
-
-        # Detect delimiter (IBEI examples are often tab-separated when copied)
-        delim = "\t" if "\t" in line else ","
-        parts = line.split(delim)
-
-        # Expect at least:
-        # 0:D, 1:IBEI, 2:PUBLISHING, 3:1, 4:CONTRACTYEAR,
-        # 5:WEEKNO, 6:SETTLEMENTDATE, 7:REGIONID,
-        # 8:ADJUSTED_SENTOUTENERGY, 9:GENERATOREMISSIONS,
-        # 10:ADJUSTED_INTENSITY_INDEX
-        if len(parts) < 11:
-            continue
-
-        settlement = parts[6]
-        region = parts[7]
-        intensity = parts[10]
+    # Keep only data rows: start with D,IBEI or D\tIBEI
+    first_row = re.search(r"^\s*D[,\t]IBEI.*$", text, flags=re.MULTILINE)
+    if first_row is None:
+        raise RuntimeError("No IBEI data rows found (D IBEI ...) in file.")
 
-        rows.append([settlement, region, intensity])
+    # Detect delimiter once (IBEI examples are often tab-separated when copied)
+    delim = "\t" if "\t" in first_row.group(0) else ","
+
+    # Expect at least:
+    # 0:D, 1:IBEI, 2:PUBLISHING, 3:1, 4:CONTRACTYEAR,
+    # 5:WEEKNO, 6:SETTLEMENTDATE, 7:REGIONID,
+    # 8:ADJUSTED_SENTOUTENERGY, 9:GENERATOREMISSIONS,
+    # 10:ADJUSTED_INTENSITY_INDEX
+    # The C parser needs the row width up front: size it from the widest line
+    # so files with longer rows (including the first) still parse
+    width = max(line.count(delim) for line in text.splitlines()) + 1
+    try:
+        raw = pd.read_csv(
+            io.StringIO(text),
+            sep=delim,
+            header=None,
+            names=range(max(width, 11)),
+            usecols=[0, 1, 6, 7, 10],
+            dtype=str,
+            engine="c",
+            skipinitialspace=True,
+            on_bad_lines="skip",
+        )
+    except ValueError:  # includes pd.errors.ParserError: no row reaches index 10
+        raise RuntimeError("No IBEI data rows found (D IBEI ...) in file.")
 
-    if not rows:
+    # Rows shorter than 11 fields are padded with NaN at index 10: drop them
+    raw = raw[raw[0].str.strip().eq("D") & raw[1].eq("IBEI") & raw[10].notna()]
+    if raw.empty:
         raise RuntimeError("No IBEI data rows found (D IBEI ...) in file.")
 
-    df = pd.DataFrame(
-        rows,
-        columns=["SETTLEMENTDATE", "REGIONID", "EMISSIONS_INTENSITY"],
-    )
+    df = raw[[6, 7, 10]].rename(
+        columns={6: "SETTLEMENTDATE", 7: "REGIONID", 10: "EMISSIONS_INTENSITY"}
+    ).reset_index(drop=True)
 
     # Make intensity numeric for later modelling
     df["EMISSIONS_INTENSITY"] = pd.to_numeric(df["EMISSIONS_INTENSITY"], errors="coerce")
@@ -120,7 +126,7 @@ def fetch_latest_ibei_emissions(save: bool = True) -> pd.DataFrame:
     latest_url = _find_latest_file_url(IBEI_INDEX_URL, (".csv", ".CSV"))
 
     logging.info("Downloading %s", latest_url)
-    resp = requests.get(latest_url, timeout=60)
+    resp = SESSION.get(latest_url, timeout=60)
     resp.raise_for_status()
 
     df = _extract_ibei_minimal(resp.text)
@@ -1,23 +1,69 @@
 import io
 import logging
+import os
 import re
+import sys
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Tuple, Union
 from urllib.parse import urljoin
 
 import pandas as pd
-import requests
+
+# Put src/ on sys.path so common.* can be imported (see common/__init__.py)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.http import INDEX_SESSION, SESSION
 
 # ---------- Config ----------
 
 PUBLIC_PRICES_INDEX_URL = "https://nemweb.com.au/Reports/Current/Public_Prices/"
 
+# Concurrent zip downloads (network-bound, so threads are enough)
+DOWNLOAD_WORKERS = 8
+
 # Project root: energy-carbon-analytics/
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"
 RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Published zips never change, so they are kept by filename between runs
+ZIP_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "public_prices"
+ZIP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Bytes per write when streaming a zip download to disk
+DOWNLOAD_CHUNK_BYTES = 1 << 20
+
+# Indices from the I,DREGION header -> field name
+DREGION_FIELDS = {
+    4: "SETTLEMENTDATE",
+    6: "REGIONID",
+    8: "RRP",
+    12: "MARKETSUSPENDEDFLAG",
+    13: "TOTALDEMAND",
+    14: "DEMANDFORECAST",
+    15: "DISPATCHABLEGENERATION",
+    17: "NETINTERCHANGE",
+    70: "INITIALSUPPLY",
+}
+DREGION_WIDTH = max(DREGION_FIELDS) + 1
+
+# Rows per read_csv chunk when streaming zip members
+CSV_CHUNK_ROWS = 200_000
+
+# Output column order
+DREGION_COLUMNS = [
+    "SETTLEMENTDATE",
+    "REGIONID",
+    "RRP",
+    "TOTALDEMAND",
+    "DEMANDFORECAST",
+    "DISPATCHABLEGENERATION",
+    "NETINTERCHANGE",
+    "INITIALSUPPLY",
+    "MARKETSUSPENDEDFLAG",
+]
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
@@ -32,7 +78,7 @@ def _list_all_price_file_urls(index_url: str) -> List[str]:
     all PUBLIC_PRICES_*.zip files, from earliest (top) to latest (bottom).
     """
     logging.info("Fetching index from %s", index_url)
-    resp = requests.get(index_url, timeout=30)
+    resp = INDEX_SESSION.get(index_url, timeout=30)
     resp.raise_for_status()
     html = resp.text
 
@@ -51,7 +97,7 @@ def _list_all_price_file_urls(index_url: str) -> List[str]:
     return urls
 
 
-def _read_csvs_from_zip(zip_bytes: bytes) -> pd.DataFrame:
+def _read_csvs_from_zip(zip_source: Union[bytes, Path]) -> pd.DataFrame:
     """
     Read only D,DREGION data rows from NEM Public Prices and extract
     the minimal set of analytical fields:
@@ -80,9 +126,12 @@ def _read_csvs_from_zip(zip_bytes: bytes) -> pd.DataFrame:
         - MARKETSUSPENDEDFLAG
     """
     logging.info("Reading CSV(s) and extracting required analytical columns")
-    records: List[list] = []
+    frames: List[pd.DataFrame] = []
 
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+    if isinstance(zip_source, bytes):
+        zip_source = io.BytesIO(zip_source)
+
+    with zipfile.ZipFile(zip_source) as zf:
         csv_names = [n for n in zf.namelist() if n.lower().endswith(".csv")]
 
         if not csv_names:
@@ -90,71 +139,44 @@ def _read_csvs_from_zip(zip_bytes: bytes) -> pd.DataFrame:
 
         for name in csv_names:
             logging.info("  -> Processing %s", name)
-            text = zf.read(name).decode("utf-8", errors="replace")
-            lines = text.splitlines()
-
-            for line in lines:
-                s = line.strip()
-
-                # Keep only data rows
-                if not s.startswith("D,DREGION"):
-                    continue
-
-                parts = s.split(",")
-
-                # Safety: need at least up to INITIALSUPPLY (index 70)
-                if len(parts) <= 70:
-                    continue
-
-                # Indices from the I,DREGION header:
-                #  4  -> SETTLEMENTDATE
-                #  6  -> REGIONID
-                #  8  -> RRP
-                #  12 -> MARKETSUSPENDEDFLAG
-                #  13 -> TOTALDEMAND
-                #  14 -> DEMANDFORECAST
-                #  15 -> DISPATCHABLEGENERATION
-                #  17 -> NETINTERCHANGE
-                #  70 -> INITIALSUPPLY
-                settlement              = parts[4]
-                region                  = parts[6]
-                rrp                     = parts[8]
-                marketsuspendedflag     = parts[12]
-                totaldemand             = parts[13]
-                demandforecast          = parts[14]
-                dispatchablegeneration  = parts[15]
-                netinterchange          = parts[17]
-                initialsupply           = parts[70]
-
-                records.append([
-                    settlement,
-                    region,
-                    rrp,
-                    totaldemand,
-                    demandforecast,
-                    dispatchablegeneration,
-                    netinterchange,
-                    initialsupply,
-                    marketsuspendedflag,
-                ])
-
-    if not records:
+            try:
+                # NEM files mix C/I/D rows of different widths, so fix the
+                # width at INITIALSUPPLY (index 70): shorter rows are padded
+                # (then dropped below), longer ones are truncated by usecols. The member is streamed
+                # in chunks so only the DREGION slice of each is kept in memory.
+                with zf.open(name) as fh, pd.read_csv(
+                    fh,
+                    header=None,
+                    names=range(DREGION_WIDTH),
+                    usecols=[0, 1, *DREGION_FIELDS],
+                    dtype=str,
+                    engine="c",
+                    encoding_errors="replace",
+                    on_bad_lines="skip",
+                    chunksize=CSV_CHUNK_ROWS,
+                ) as reader:
+                    for chunk in reader:
+                        # Keep only data rows that reach INITIALSUPPLY; padded
+                        # short rows have NaN there and are dropped
+                        chunk = chunk[
+                            chunk[0].eq("D") & chunk[1].eq("DREGION") & chunk[70].notna()
+                        ]
+                        frames.append(
+                            chunk[list(DREGION_FIELDS)].rename(columns=DREGION_FIELDS)
+                        )
+            except pd.errors.ParserError:
+                # No row reaches INITIALSUPPLY, so there is no DREGION data here
+                logging.warning("  -> No D,DREGION rows in %s, skipping", name)
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if df.empty:
         raise RuntimeError("No D,DREGION rows found in any CSV.")
 
-    df = pd.DataFrame(
-        records,
-        columns=[
-            "SETTLEMENTDATE",
-            "REGIONID",
-            "RRP",
-            "TOTALDEMAND",
-            "DEMANDFORECAST",
-            "DISPATCHABLEGENERATION",
-            "NETINTERCHANGE",
-            "INITIALSUPPLY",
-            "MARKETSUSPENDEDFLAG",
-        ],
-    )
+    df = df[DREGION_COLUMNS]
+
+    numeric_cols = [c for c in DREGION_COLUMNS if c not in ("SETTLEMENTDATE", "REGIONID")]
+    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
+
     logging.info("Extracted %s rows with required analytical columns", len(df))
     return df
 
@@ -180,13 +202,36 @@ def fetch_all_current_public_prices(save: bool = True) -> pd.DataFrame:
     """
     from_this_index = _list_all_price_file_urls(PUBLIC_PRICES_INDEX_URL)
 
-    frames = []
-    for url in from_this_index:
+    # Drop cached zips that have rolled off the Current/ directory
+    current_names = {url.rsplit("/", 1)[-1] for url in from_this_index}
+    for cached in ZIP_CACHE_DIR.glob("*.zip"):
+        if cached.name not in current_names:
+            cached.unlink()
+
+    def _fetch(url: str) -> Path:
+        cached = ZIP_CACHE_DIR / url.rsplit("/", 1)[-1]
+        if cached.exists():
+            logging.info("Using cached %s", cached.name)
+            return cached
+
         logging.info("Downloading %s", url)
-        resp = requests.get(url, timeout=120)
-        resp.raise_for_status()
-        df_part = _read_csvs_from_zip(resp.content)
-        frames.append(df_part)
+        # Stream straight to disk (never holding the whole zip in memory);
+        # write-then-rename so an interrupted run never leaves a partial zip
+        tmp_path = cached.with_suffix(".part")
+        with SESSION.get(url, timeout=120, stream=True) as resp:
+            resp.raise_for_status()
+            with open(tmp_path, "wb") as fh:
+                for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                    fh.write(chunk)
+        os.replace(tmp_path, cached)
+        return cached
+
+    # Downloads run concurrently; map() yields in index order, so each zip is
+    # parsed here while the remaining ones are still in flight.
+    frames = []
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        for zip_path in executor.map(_fetch, from_this_index):
+            frames.append(_read_csvs_from_zip(zip_path))
 
     combined = pd.concat(frames, ignore_index=True)
     logging.info("Combined Public_Prices (Current/) shape: %s", combined.shape)
@@ -0,0 +1,162 @@
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+load_dotenv()
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PROCESSED_DATA_DIR = PROJECT_ROOT / "data" / "processed"
+
+SCHEMA = "public"
+
+# Destination table -> (processed CSV, upsert key)
+TABLES = {
+    "prices_clean": (PROCESSED_DATA_DIR / "prices_clean.csv", ("timestamp", "region")),
+    "emissions_clean": (PROCESSED_DATA_DIR / "emissions_clean.csv", ("timestamp", "region")),
+    "price_emissions_joined": (
+        PROCESSED_DATA_DIR / "price_emissions_joined.csv",
+        ("timestamp", "region"),
+    ),
+    "daily_price_features": (
+        PROCESSED_DATA_DIR / "daily_price_features.csv",
+        ("date", "region"),
+    ),
+}
+
+# Rows sampled to infer column types for the DDL
+TYPE_SAMPLE_ROWS = 1000
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _pg_type(series: pd.Series) -> str:
+    """Map a sampled CSV column to a Postgres column type."""
+    if pd.api.types.is_bool_dtype(series):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(series):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(series):
+        return "DOUBLE PRECISION"
+
+    values = series.dropna().astype(str)
+    if values.empty:
+        return "TEXT"
+    parsed = pd.to_datetime(values, format="ISO8601", errors="coerce")
+    if parsed.notna().all():
+        # "YYYY-MM-DD" only -> DATE, otherwise a full timestamp
+        return "DATE" if (values.str.len() == 10).all() else "TIMESTAMP"
+    return "TEXT"
+
+
+def _load_csv_to_table(
+    engine: Engine,
+    csv_path: Path,
+    table_name: str,
+    key_columns: Tuple[str, ...],
+    schema: str = SCHEMA,
+) -> int:
+    """
+    Upsert the contents of csv_path into schema.table_name, keyed by
+    key_columns.
+
+    The table (and a unique index on the key) is created once and then kept,
+    so indexes and constraints survive reloads. Each load streams the file
+    into a temp staging table with COPY ... FROM STDIN and merges it with
+    INSERT ... ON CONFLICT DO UPDATE, which only rewrites rows whose values
+    changed; rows not in the file are left alone.
+    """
+    sample = pd.read_csv(csv_path, nrows=TYPE_SAMPLE_ROWS)
+    col_types = {col: _pg_type(sample[col]) for col in sample.columns}
+    target = f"{_quote(schema)}.{_quote(table_name)}"
+    staging = _quote(f"stg_{table_name}")
+
+    cols = ", ".join(_quote(col) for col in col_types)
+    keys = ", ".join(_quote(col) for col in key_columns)
+    values = [_quote(col) for col in col_types if col not in key_columns]
+    updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in values)
+    # Only rewrite rows whose values changed: an unchanged row then costs no
+    # new tuple version and no WAL
+    changed = (
+        f"({', '.join(f'tgt.{col}' for col in values)}) IS DISTINCT FROM "
+        f"({', '.join(f'EXCLUDED.{col}' for col in values)})"
+    )
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            col_defs = ", ".join(f"{_quote(col)} {pg_type}" for col, pg_type in col_types.items())
+            cur.execute(f"CREATE TABLE IF NOT EXISTS {target} ({col_defs})")
+            for col, pg_type in col_types.items():
+                cur.execute(f"ALTER TABLE {target} ADD COLUMN IF NOT EXISTS {_quote(col)} {pg_type}")
+            cur.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(f'{table_name}_key')} "
+                f"ON {target} ({keys})"
+            )
+
+            # No unique index on staging, so duplicate keys in the file do not
+            # abort the COPY; DISTINCT ON keeps one row per key for the merge
+            cur.execute(
+                f"CREATE TEMP TABLE {staging} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            with open(csv_path, "r", encoding="utf-8") as fh:
+                cur.copy_expert(
+                    f"COPY {staging} ({cols}) FROM STDIN WITH (FORMAT CSV, HEADER TRUE)",
+                    fh,
+                )
+            cur.execute(
+                f"INSERT INTO {target} AS tgt ({cols}) "
+                f"SELECT DISTINCT ON ({keys}) {cols} FROM {staging} ORDER BY {keys} "
+                f"ON CONFLICT ({keys}) DO "
+                + (f"UPDATE SET {updates} WHERE {changed}" if values else "NOTHING")
+            )
+            rows = cur.rowcount
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    logging.info("Upserted %s new or changed rows into %s", rows, target)
+    return rows
+
+
+def load_all_tables(database_url: str = None) -> Dict[str, int]:
+    """
+    Upsert every processed CSV that exists into Postgres.
+    Returns rows written per table.
+    """
+    database_url = database_url or os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("Please set DATABASE_URL in your environment.")
+
+    engine = create_engine(database_url)
+    loaded: Dict[str, int] = {}
+    try:
+        for table_name, (csv_path, key_columns) in TABLES.items():
+            if not csv_path.exists():
+                logging.warning("Skipping %s: %s not found", table_name, csv_path)
+                continue
+            logging.info("Loading %s into %s.%s", csv_path, SCHEMA, table_name)
+            loaded[table_name] = _load_csv_to_table(engine, csv_path, table_name, key_columns)
+    finally:
+        engine.dispose()
+    return loaded
+
+
+if __name__ == "__main__":
+    logging.info("Loading processed tables into Postgres...")
+    counts = load_all_tables()
+    logging.info("Done. Rows loaded: %s", counts)
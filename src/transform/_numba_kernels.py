@@ -0,0 +1,62 @@
+import numba as nb
+import numpy as np
+
+
+@nb.njit(parallel=True, cache=True)
+def grouped_pearson(offsets: np.ndarray, x: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation of x with each column of ys, per group.
+
+    Rows must be sorted by group; group g spans rows offsets[g]:offsets[g + 1].
+    Each pair uses only rows where both values are finite (pairwise-complete,
+    like Series.corr). Returns an (n_groups, n_cols) array, NaN where a
+    correlation is undefined.
+    """
+    n_groups = offsets.shape[0] - 1
+    n_cols = ys.shape[1]
+    out = np.full((n_groups, n_cols), np.nan)
+
+    for g in nb.prange(n_groups):
+        start = offsets[g]
+        stop = offsets[g + 1]
+        for k in range(n_cols):
+            # pass 1: means and ranges over pairwise-complete rows
+            n = 0
+            sum_x = 0.0
+            sum_y = 0.0
+            min_x = np.inf
+            max_x = -np.inf
+            min_y = np.inf
+            max_y = -np.inf
+            for i in range(start, stop):
+                if np.isfinite(x[i]) and np.isfinite(ys[i, k]):
+                    n += 1
+                    sum_x += x[i]
+                    sum_y += ys[i, k]
+                    min_x = min(min_x, x[i])
+                    max_x = max(max_x, x[i])
+                    min_y = min(min_y, ys[i, k])
+                    max_y = max(max_y, ys[i, k])
+            # a constant column has no defined correlation; checking exactly
+            # avoids reporting rounding noise from the mean as a value
+            if n < 2 or min_x == max_x or min_y == max_y:
+                continue
+            mean_x = sum_x / n
+            mean_y = sum_y / n
+
+            # pass 2: centred sums (stable when a column is near constant)
+            sxy = 0.0
+            sxx = 0.0
+            syy = 0.0
+            for i in range(start, stop):
+                if np.isfinite(x[i]) and np.isfinite(ys[i, k]):
+                    dx = x[i] - mean_x
+                    dy = ys[i, k] - mean_y
+                    sxy += dx * dy
+                    sxx += dx * dx
+                    syy += dy * dy
+            denom = np.sqrt(sxx * syy)
+            if denom > 0:
+                out[g, k] = min(max(sxy / denom, -1.0), 1.0)
+
+    return out
@@ -1,9 +1,21 @@
 import logging
+import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+# Put src/ on sys.path so common.* and transform.* can be imported (see common/__init__.py)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.io import read_table, write_table
+
+try:
+    from transform._numba_kernels import grouped_pearson
+except ModuleNotFoundError as exc:
+    if exc.name != "numba":
+        raise
+    grouped_pearson = None  # numba not installed: fall back to pandas groupby reductions
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 PROCESSED_DATA_DIR = PROJECT_ROOT / "data" / "processed"
 PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -17,13 +29,35 @@ logging.basicConfig(
 )
 
 
-def _mad_z(series: pd.Series) -> pd.Series:
-    """Median absolute deviation based z-score."""
-    median = series.median()
-    mad = (series - median).abs().median()
-    if mad == 0 or np.isnan(mad):
-        return pd.Series(np.nan, index=series.index)
-    return 0.6745 * (series - median) / mad
+def _grouped_corr(x: pd.Series, y: pd.Series, keys: list) -> pd.Series:
+    """
+    Pearson correlation of x and y per group, over pairwise-complete rows
+    (same result as Series.corr per group, without a Python loop).
+    """
+    valid = x.notna() & y.notna()
+    pairs = pd.DataFrame({"x": x.where(valid), "y": y.where(valid)})
+    # centre on group means first: raw sum-of-squares cancels badly when a
+    # column is (near) constant within a day, e.g. daily emissions intensity
+    dev = pairs - pairs.groupby(keys, observed=True).transform("mean")
+    sums = (
+        pd.DataFrame(
+            {
+                "xy": dev["x"] * dev["y"],
+                "xx": dev["x"] ** 2,
+                "yy": dev["y"] ** 2,
+            }
+        )
+        .groupby(keys, observed=True)
+        .sum()
+    )
+    # a constant column has no defined correlation; checking exactly (as the
+    # numba kernel does) avoids reporting rounding noise from the mean
+    grouped = pairs.groupby(keys, observed=True)
+    spread = grouped.max() - grouped.min()
+    constant = (spread["x"] == 0) | (spread["y"] == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = sums["xy"] / np.sqrt(sums["xx"] * sums["yy"])
+    return corr.mask(constant).clip(-1, 1)
 
 
 def _intraday_correlations(df: pd.DataFrame) -> pd.DataFrame:
@@ -33,30 +67,42 @@ def _intraday_correlations(df: pd.DataFrame) -> pd.DataFrame:
       - price ~ emissions_intensity
       - price ~ forecast_error (total_demand - demand_forecast)
     """
-    rows = []
-    for (date, region), grp in df.groupby(["date", "region"]):
-        grp = grp.sort_values("timestamp")
-        if len(grp) < 4:
-            continue
-
-        price = grp["price"]
-        demand = grp["total_demand"]
-        emissions = grp["emissions_intensity"]
-        forecast = grp.get("demand_forecast")
-        forecast_error_series = demand - forecast if forecast is not None else None
-
-        rows.append(
-            {
-                "date": date,
-                "region": region,
-                "demand_price_corr": price.corr(demand),
-                "carbon_price_corr": price.corr(emissions),
-                "forecast_error_price_corr": price.corr(forecast_error_series)
-                if forecast_error_series is not None
-                else np.nan,
-            }
+    keys = [df["date"], df["region"]]
+    price = df["price"]
+    if "demand_forecast" in df.columns:
+        forecast_error = df["total_demand"] - df["demand_forecast"]
+    else:
+        forecast_error = pd.Series(np.nan, index=df.index)
+    targets = {
+        "demand_price_corr": df["total_demand"],
+        "carbon_price_corr": df["emissions_intensity"],
+        "forecast_error_price_corr": forecast_error,
+    }
+
+    grouped = df.groupby(keys, observed=True)
+    sizes = grouped.size()
+
+    if grouped_pearson is not None:
+        # one JIT pass over rows ordered by group id; rows with a null date or
+        # region have no group (NaN id) and are left out, as groupby does
+        group_ids = grouped.ngroup().to_numpy()
+        in_group = ~np.isnan(group_ids)
+        group_ids = group_ids[in_group].astype(np.int64)
+        order = np.flatnonzero(in_group)[np.argsort(group_ids, kind="stable")]
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(group_ids, minlength=len(sizes)), out=offsets[1:])
+        # inputs keep their float32/float64 dtype; the kernel accumulates in float64
+        ys = np.column_stack([y.to_numpy()[order] for y in targets.values()])
+        corr = grouped_pearson(offsets, price.to_numpy()[order], ys)
+        out = pd.DataFrame(corr, index=sizes.index, columns=list(targets))
+    else:
+        out = pd.DataFrame(
+            {name: _grouped_corr(price, y, keys) for name, y in targets.items()}
         )
-    return pd.DataFrame(rows)
+
+    out = out[sizes >= 4]
+    out.index.names = ["date", "region"]
+    return out.reset_index()
 
 
 def build_daily_features(joined_path: Path = JOINED_PATH) -> pd.DataFrame:
@@ -67,19 +113,19 @@ def build_daily_features(joined_path: Path = JOINED_PATH) -> pd.DataFrame:
       - Price-demand and carbon-price correlations
       - Forecast error + supply/demand gap/margin
       - Price anomaly flag (z + MAD)
-    Output: data/processed/daily_price_features.csv
+    Output: data/processed/daily_price_features.csv (+ .parquet)
     """
     logging.info("Loading joined data from %s", joined_path)
-    df = pd.read_csv(joined_path, parse_dates=["timestamp"])
+    df = read_table(joined_path, parse_dates=["timestamp", "date"], categories=["region"])
     if "date" not in df.columns:
-        df["date"] = df["timestamp"].dt.date
+        df["date"] = df["timestamp"].dt.floor("D")
 
     # intraday correlations
     corr_df = _intraday_correlations(df)
 
     logging.info("Aggregating daily metrics...")
     daily = (
-        df.groupby(["date", "region"])
+        df.groupby(["date", "region"], observed=True)
         .agg(
             price_mean=("price", "mean"),
             price_median=("price", "median"),
@@ -105,7 +151,7 @@ def build_daily_features(joined_path: Path = JOINED_PATH) -> pd.DataFrame:
     daily["forecast_error"] = daily["total_demand_mean"] - daily["demand_forecast_mean"]
 
     # rolling 7-day trends/volatility
-    daily = daily.sort_values(["region", "date"]).reset_index(drop=True)
+    daily = daily.sort_values(["region", "date"], ignore_index=True)
     for col, out_col in [
         ("price_mean", "price_mean_roll7"),
         ("price_std", "price_std_roll7"),
@@ -113,15 +159,21 @@ def build_daily_features(joined_path: Path = JOINED_PATH) -> pd.DataFrame:
         ("emissions_intensity_mean", "emissions_mean_roll7"),
     ]:
         daily[out_col] = (
-            daily.groupby("region")[col]
+            daily.groupby("region", observed=True)[col]
             .transform(lambda s: s.rolling(window=7, min_periods=3).mean())
         )
 
     # price anomaly detection
-    daily["price_z"] = daily.groupby("region")["price_mean"].transform(
-        lambda s: (s - s.mean()) / s.std(ddof=0)
-    )
-    daily["price_mad_z"] = daily.groupby("region")["price_mean"].transform(_mad_z)
+    # one grouper, built-in (cythonised) transforms only: no per-group lambdas
+    price = daily["price_mean"]
+    by_region = price.groupby(daily["region"], observed=True)
+    daily["price_z"] = (price - by_region.transform("mean")) / by_region.transform("std", ddof=0)
+
+    # median absolute deviation based z-score (NaN where MAD is 0)
+    median = by_region.transform("median")
+    deviation = price - median
+    mad = deviation.abs().groupby(daily["region"], observed=True).transform("median")
+    daily["price_mad_z"] = 0.6745 * deviation / mad.where(mad != 0)
     daily["is_price_anomaly"] = (daily["price_z"].abs() > 3) | (daily["price_mad_z"].abs() > 3)
 
     # merge correlations
@@ -132,11 +184,11 @@ def build_daily_features(joined_path: Path = JOINED_PATH) -> pd.DataFrame:
 
 def run_full_analysis() -> pd.DataFrame:
     """
-    Compute and persist daily_price_features.csv for dashboards.
+    Compute and persist daily_price_features.csv (+ .parquet) for dashboards.
     """
     daily = build_daily_features(JOINED_PATH)
     logging.info("Saving daily features to %s (rows=%s)", DAILY_FEATURES_PATH, len(daily))
-    daily.to_csv(DAILY_FEATURES_PATH, index=False)
+    write_table(daily, DAILY_FEATURES_PATH)
     return daily
 
 
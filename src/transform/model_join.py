@@ -1,8 +1,15 @@
 import logging
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+# Put src/ on sys.path so common.* and clean.* can be imported (see common/__init__.py)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from clean.clean_emissions import VALID_REGIONS as EMISSIONS_REGIONS
+from clean.clean_prices import VALID_REGIONS as PRICE_REGIONS
+from common.io import read_table, write_table
+
 # ---------- Paths ----------
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -13,6 +20,10 @@ PRICES_PATH = PROCESSED_DATA_DIR / "prices_clean.csv"
 EMISSIONS_PATH = PROCESSED_DATA_DIR / "emissions_clean.csv"
 JOINED_PATH = PROCESSED_DATA_DIR / "price_emissions_joined.csv"
 
+# Shared region categories so the join compares category codes; sorted so
+# ordering by code matches ordering by name
+REGION_DTYPE = pd.CategoricalDtype(sorted(set(PRICE_REGIONS) | set(EMISSIONS_REGIONS)))
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
@@ -32,28 +43,40 @@ def build_price_emissions_join(
       - emissions_intensity
     """
     logging.info("Loading clean prices from %s", prices_path)
-    prices = pd.read_csv(prices_path, parse_dates=["timestamp"])
+    prices = read_table(prices_path, parse_dates=["timestamp"], categories=["region"])
+    prices["region"] = prices["region"].astype(REGION_DTYPE)
 
     logging.info("Loading clean emissions from %s", emissions_path)
-    emissions = pd.read_csv(emissions_path, parse_dates=["timestamp"])
+    emissions = read_table(emissions_path, parse_dates=["timestamp"], categories=["region"])
+    emissions["region"] = emissions["region"].astype(REGION_DTYPE)
 
-    # Derive pure date key (no time) for both
-    prices["date"] = prices["timestamp"].dt.date
-    emissions["date"] = emissions["timestamp"].dt.date
+    # Derive pure date key (no time) for both; floor keeps datetime64 so the
+    # merge hashes int64 keys instead of datetime.date objects
+    prices["date"] = prices["timestamp"].dt.floor("D")
+    emissions["date"] = emissions["timestamp"].dt.floor("D")
 
     logging.info("Joining on [date, region]...")
-    joined = pd.merge(
-        prices,
-        emissions[["date", "region", "emissions_intensity"]],
-        on=["date", "region"],
-        how="left",  # keep all price intervals even if an emissions day is missing
-    )
+    intensity = emissions.set_index(["date", "region"])["emissions_intensity"]
+    if intensity.index.is_unique:
+        # One emissions row per (date, region): look it up by key instead of
+        # hash-merging, so the wide prices frame is not copied. Missing days
+        # give NaN, keeping all price intervals.
+        keys = pd.MultiIndex.from_arrays([prices["date"], prices["region"]])
+        joined = prices
+        joined["emissions_intensity"] = intensity.reindex(keys).to_numpy()
+    else:
+        joined = pd.merge(
+            prices,
+            emissions[["date", "region", "emissions_intensity"]],
+            on=["date", "region"],
+            how="left",  # keep all price intervals even if an emissions day is missing
+        )
 
     # Sort for sanity
-    joined = joined.sort_values(["timestamp", "region"]).reset_index(drop=True)
+    joined = joined.sort_values(["timestamp", "region"], ignore_index=True)
 
     logging.info("Saving joined table to %s (rows=%s)", output_path, len(joined))
-    joined.to_csv(output_path, index=False)
+    write_table(joined, output_path)
 
     return joined
 